@@ -1,20 +1,57 @@
 import os
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file and snapshot them, so re-imports
+# (workers, reloads, test runners) don't re-read the file or walk os.environ
+# again. The file is only re-parsed when it actually changes on disk, so a
+# no-op reload costs a single stat() call.
+_ENV_FILE = '.env'
+_env_file_key = ()  # sentinel that never matches a real stat key
+
+
+def _load_env() -> dict:
+    """Load the .env file (if changed) and return an environment snapshot"""
+    global _env_file_key
+    try:
+        st = os.stat(_ENV_FILE)
+        key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    except OSError:
+        key = None
+    if key != _env_file_key:
+        load_dotenv()
+        _env_file_key = key
+    return dict(os.environ)
+
+
+_ENV = _load_env()
+
+# Values treated as "true" when coercing boolean settings
+_TRUE_VALUES = frozenset({'1', 'true', 'yes', 'on'})
+
+
+def _int(key: str, default: int) -> int:
+    """Read an integer setting from the environment snapshot"""
+    value = _ENV.get(key)
+    return int(value) if value else default
+
+
+def _bool(key: str, default: bool = False) -> bool:
+    """Read a boolean setting from the environment snapshot"""
+    value = _ENV.get(key)
+    return value.lower() in _TRUE_VALUES if value is not None else default
 
 class Config:
     """Configuration class for the Social Media Info Extractor API"""
     
     # API Configuration
-    API_HOST = os.getenv('API_HOST', '0.0.0.0')
-    API_PORT = int(os.getenv('API_PORT', '8000'))
-    DEBUG = os.getenv('DEBUG', 'false').lower() == 'true'
-    
+    API_HOST = _ENV.get('API_HOST', '0.0.0.0')
+    API_PORT = _int('API_PORT', 8000)
+    DEBUG = _bool('DEBUG')
+
     # Extraction Configuration
-    EXTRACTION_TIMEOUT = int(os.getenv('EXTRACTION_TIMEOUT', '30'))  # 30 seconds timeout
-    MAX_URL_LENGTH = int(os.getenv('MAX_URL_LENGTH', '2048'))  # Maximum URL length
+    EXTRACTION_TIMEOUT = _int('EXTRACTION_TIMEOUT', 30)  # 30 seconds timeout
+    MAX_URL_LENGTH = _int('MAX_URL_LENGTH', 2048)  # Maximum URL length
+    MAX_CONCURRENT_EXTRACTIONS = _int('MAX_CONCURRENT_EXTRACTIONS', 10)  # Parallel extraction limit
     
     @classmethod
     def print_config(cls):
@@ -24,4 +61,5 @@ class Config:
         print(f"Debug: {cls.DEBUG}")
         print(f"Extraction Timeout: {cls.EXTRACTION_TIMEOUT} seconds")
         print(f"Max URL Length: {cls.MAX_URL_LENGTH} characters")
+        print(f"Max Concurrent Extractions: {cls.MAX_CONCURRENT_EXTRACTIONS}")
         print("=" * 50) 
\ No newline at end of file
@@ -1,43 +1,100 @@
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, HttpUrl
 import yt_dlp
-import os
 import asyncio
 import json
-from datetime import datetime
 from typing import Optional, Dict, Any, List
-import uuid
+import functools
 import logging
 import time
-from pathlib import Path
 import requests
 import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Use orjson for JSON parsing when available (2-5x faster than stdlib json)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Optional TikTok helper libraries, resolved once at import instead of
+# re-attempting the import on every extraction
+try:
+    from tiktok_api import TikTokApi
+except ImportError:
+    TikTokApi = None
+try:
+    from tiktok_downloader import TikTokDownloader
+except ImportError:
+    TikTokDownloader = None
+
+# Advertise brotli only when a decoder is actually importable; otherwise
+# servers may send 'br' bodies we cannot decompress
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+# Shared HTTP session so API probes reuse pooled connections (keep-alive,
+# TLS session resumption) instead of handshaking on every call
+_http_session = requests.Session()
+_http_session.headers['Accept-Encoding'] = _ACCEPT_ENCODING
+_http_adapter = requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+_http_session.mount('https://', _http_adapter)
+_http_session.mount('http://', _http_adapter)
+
 # Import configuration
 try:
     from config import Config
     logger.info("Configuration loaded successfully")
 except ImportError as e:
+    Config = None
     logger.warning(f"Configuration not available: {e}")
 
-# Lifespan context manager for startup/shutdown
-from contextlib import asynccontextmanager
+# Gate concurrent extractions so a request burst can't spawn an unbounded
+# number of yt-dlp worker threads
+extraction_semaphore = asyncio.BoundedSemaphore(
+    Config.MAX_CONCURRENT_EXTRACTIONS if Config else 10
+)
+
+async def _prune_info_cache():
+    """Periodically drop expired entries from the per-URL info cache"""
+    while True:
+        await asyncio.sleep(_INFO_CACHE_TTL)
+        now = time.monotonic()
+        expired = [url for url, entry in _info_cache.items() if entry[0] <= now]
+        for url in expired:
+            _info_cache.pop(url, None)
+        if expired:
+            logger.info(f"Pruned {len(expired)} expired info cache entries")
 
+# Lifespan context manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown"""
     # Startup
     logger.info("Starting up Social Media Info Extractor API...")
-    
+    prune_task = asyncio.create_task(_prune_info_cache())
+
     yield
-    
-    # Shutdown
+
+    # Shutdown: cancel and await the background task so nothing leaks
+    prune_task.cancel()
+    await asyncio.gather(prune_task, return_exceptions=True)
     logger.info("Shutting down gracefully...")
 
 app = FastAPI(
@@ -91,138 +148,154 @@ class SocialMediaInfo(BaseModel):
     error_message: Optional[str] = None
     time_end: Optional[int] = None
 
+# Single alternation over all platform domains; the matching group name is
+# the platform identifier, so detection is one C-level regex scan
+_PLATFORM_RE = re.compile(
+    r'(?P<tiktok>tiktok\.com)'
+    r'|(?P<youtube>youtube\.com|youtu\.be)'
+    r'|(?P<instagram>instagram\.com)'
+    r'|(?P<facebook>facebook\.com|fb\.com)'
+    r'|(?P<twitter>twitter\.com|x\.com)'
+    r'|(?P<reddit>reddit\.com)'
+    r'|(?P<pinterest>pinterest\.com)'
+    r'|(?P<snapchat>snapchat\.com)'
+    r'|(?P<linkedin>linkedin\.com)'
+    r'|(?P<twitch>twitch\.tv)'
+    r'|(?P<vimeo>vimeo\.com)'
+    r'|(?P<dailymotion>dailymotion\.com)'
+)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_url(url: str):
+    """Parse a URL once and cache the result; urlparse is pure Python and
+    shows up on every hot path that touches URLs"""
+    return urlparse(url)
+
+@functools.lru_cache(maxsize=4096)
 def detect_platform(url: str) -> str:
     """Detect the social media platform from URL"""
-    url_lower = url.lower()
-    
-    if 'tiktok.com' in url_lower:
-        return 'tiktok'
-    elif 'youtube.com' in url_lower or 'youtu.be' in url_lower:
-        return 'youtube'
-    elif 'instagram.com' in url_lower:
-        return 'instagram'
-    elif 'facebook.com' in url_lower or 'fb.com' in url_lower:
-        return 'facebook'
-    elif 'twitter.com' in url_lower or 'x.com' in url_lower:
-        return 'twitter'
-    elif 'reddit.com' in url_lower:
-        return 'reddit'
-    elif 'pinterest.com' in url_lower:
-        return 'pinterest'
-    elif 'snapchat.com' in url_lower:
-        return 'snapchat'
-    elif 'linkedin.com' in url_lower:
-        return 'linkedin'
-    elif 'twitch.tv' in url_lower:
-        return 'twitch'
-    elif 'vimeo.com' in url_lower:
-        return 'vimeo'
-    elif 'dailymotion.com' in url_lower:
-        return 'dailymotion'
-    else:
-        return 'unknown'
+    host = _parse_url(url).netloc.lower()
+
+    match = _PLATFORM_RE.search(host)
+    return match.lastgroup if match else 'unknown'
+
+# Precompiled URL patterns for video ID extraction, tried in order
+_VIDEO_ID_PATTERNS = {
+    'tiktok': (re.compile(r'/video/([^?]+)'), re.compile(r'@.+/v/([^?]+)')),
+    'youtube': (re.compile(r'youtube\.com/watch\?v=([^&]+)'), re.compile(r'youtu\.be/([^?]+)')),
+    'instagram': (re.compile(r'/(?:p|reel)/([^/?]+)'),),
+    'facebook': (re.compile(r'/videos/([^/?]+)'),),
+    'twitter': (re.compile(r'/status/([^?]+)'),),
+}
 
+# Precompiled URL patterns for user/channel ID extraction, tried in order
+_UNIQUE_ID_PATTERNS = {
+    'tiktok': (re.compile(r'@([^/?]+)'),),
+    'youtube': (re.compile(r'/channel/([^/?]+)'), re.compile(r'/c/([^/?]+)')),
+    'instagram': (re.compile(r'/([^/]+)/(?:p|reel)/'),),  # Username is before /p/ or /reel/
+}
+
+@functools.lru_cache(maxsize=4096)
 def extract_video_id(url: str, platform: str) -> Optional[str]:
     """Extract video ID from URL based on platform"""
-    try:
-        if platform == 'tiktok':
-            # Extract from TikTok URL patterns
-            if '/video/' in url:
-                return url.split('/video/')[-1].split('?')[0]
-            elif '@' in url and '/v/' in url:
-                return url.split('/v/')[-1].split('?')[0]
-        elif platform == 'youtube':
-            # Extract from YouTube URL patterns
-            if 'youtube.com/watch?v=' in url:
-                return url.split('v=')[1].split('&')[0]
-            elif 'youtu.be/' in url:
-                return url.split('youtu.be/')[1].split('?')[0]
-        elif platform == 'instagram':
-            # Extract from Instagram URL patterns
-            if '/p/' in url:
-                return url.split('/p/')[1].split('/')[0]
-            elif '/reel/' in url:
-                return url.split('/reel/')[1].split('/')[0]
-        elif platform == 'facebook':
-            # Extract from Facebook URL patterns
-            if '/videos/' in url:
-                return url.split('/videos/')[1].split('/')[0]
-        elif platform == 'twitter':
-            # Extract from Twitter/X URL patterns
-            if '/status/' in url:
-                return url.split('/status/')[1].split('?')[0]
-    except:
-        pass
+    for pattern in _VIDEO_ID_PATTERNS.get(platform, ()):
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
     return None
 
+@functools.lru_cache(maxsize=4096)
 def extract_unique_id(url: str, platform: str) -> Optional[str]:
     """Extract unique user ID from URL based on platform"""
-    try:
-        if platform == 'tiktok':
-            # Extract @username from TikTok
-            if '@' in url:
-                username = url.split('@')[1].split('/')[0]
-                return username
-        elif platform == 'youtube':
-            # Extract channel ID from YouTube
-            if '/channel/' in url:
-                return url.split('/channel/')[1].split('/')[0]
-            elif '/c/' in url:
-                return url.split('/c/')[1].split('/')[0]
-        elif platform == 'instagram':
-            # Extract username from Instagram
-            if '/' in url:
-                parts = url.split('/')
-                for i, part in enumerate(parts):
-                    if part in ['p', 'reel'] and i + 1 < len(parts):
-                        return parts[i - 1]  # Username is before /p/ or /reel/
-    except:
-        pass
+    for pattern in _UNIQUE_ID_PATTERNS.get(platform, ()):
+        match = pattern.search(url)
+        if match:
+            return match.group(1)
     return None
 
-def get_yt_dlp_opts(platform: str = None) -> Dict[str, Any]:
-    """Get yt-dlp options for metadata extraction"""
-    base_opts = {
-        'quiet': True,
-        'no_warnings': True,
-        'extract_flat': False,
-        'skip_download': True,
-        'writeinfojson': False,
-        'writethumbnail': False,
-        'writesubtitles': False,
-        'writeautomaticsub': False,
-        'ignoreerrors': False,
-        'no_check_certificate': True,
-        'http_headers': {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Cache-Control': 'max-age=0'
-        }
+# Desktop browser headers sent with yt-dlp metadata requests
+_BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+    'Cache-Control': 'max-age=0'
+}
+
+# Mobile Safari user agent shared by the TikTok probes
+_MOBILE_UA = 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1'
+
+# Headers for direct TikTok API requests
+_TIKTOK_API_HEADERS = {
+    'User-Agent': _MOBILE_UA,
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'Connection': 'keep-alive'
+}
+
+# Mobile browser headers for TikTok page extraction via yt-dlp
+_MOBILE_HTML_HEADERS = {
+    'User-Agent': _MOBILE_UA,
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Static yt-dlp options shared by every metadata extraction
+_BASE_YDL_OPTS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': False,
+    'skip_download': True,
+    'writeinfojson': False,
+    'writethumbnail': False,
+    'writesubtitles': False,
+    'writeautomaticsub': False,
+    'ignoreerrors': False,
+    'no_check_certificate': True,
+}
+
+# TikTok extractor arguments for yt-dlp
+_TIKTOK_EXTRACTOR_ARGS = {
+    'tiktok': {
+        'api_hostname': 'api16-normal-c-useast1a.tiktokv.com',
+        'app_version': '1.0.0',
+        'manifest_app_version': '1.0.0'
     }
-    
+}
+
+@functools.lru_cache(maxsize=32)
+def _yt_dlp_opts_template(platform: Optional[str]) -> Dict[str, Any]:
+    """Build the yt-dlp options for a platform once; callers receive copies"""
+    base_opts = dict(_BASE_YDL_OPTS)
+    base_opts['http_headers'] = _BROWSER_HEADERS
+
     # Platform-specific options
     if platform == 'tiktok':
-        base_opts.update({
-            'extractor_args': {
-                'tiktok': {
-                    'api_hostname': 'api16-normal-c-useast1a.tiktokv.com',
-                    'app_version': '1.0.0',
-                    'manifest_app_version': '1.0.0'
-                }
-            }
-        })
-    
+        base_opts['extractor_args'] = _TIKTOK_EXTRACTOR_ARGS
+
     return base_opts
 
+def get_yt_dlp_opts(platform: str = None) -> Dict[str, Any]:
+    """Get yt-dlp options for metadata extraction"""
+    # Shallow-copy the cached template (plus the nested dicts callers or
+    # yt-dlp may mutate) instead of rebuilding ~15 keys per call
+    opts = dict(_yt_dlp_opts_template(platform))
+    opts['http_headers'] = dict(opts['http_headers'])
+    if 'extractor_args' in opts:
+        opts['extractor_args'] = {k: dict(v) for k, v in opts['extractor_args'].items()}
+    return opts
+
 def categorize_media_format(format_info: Dict[str, Any], platform: str) -> Dict[str, Any]:
     """Categorize media format based on platform and format info"""
     media_info = {
@@ -292,6 +365,36 @@ def categorize_media_format(format_info: Dict[str, Any], platform: str) -> Dict[
     
     return media_info
 
+def _ydl_extract_info(url: str, ydl_opts: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Run yt-dlp metadata extraction synchronously (called from a worker thread)"""
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        return ydl.extract_info(url, download=False)
+
+async def _race_extract_attempts(url: str, opts_variants) -> Optional[Dict[str, Any]]:
+    """Run several yt-dlp option variants concurrently and return the first
+    usable result, cancelling the attempts still pending"""
+    pending = {
+        asyncio.create_task(asyncio.to_thread(_ydl_extract_info, url, opts))
+        for opts in opts_variants
+    }
+    result = None
+    try:
+        while pending and result is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                try:
+                    info = task.result()
+                except Exception as e:
+                    logger.warning(f"Extraction attempt failed: {e}")
+                    continue
+                if info and not info.get('_type') == 'playlist':
+                    result = info
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+    return result
+
 async def extract_tiktok_cdn_direct(url: str) -> Optional[Dict[str, Any]]:
     """Direct TikTok CDN extraction using alternative methods"""
     try:
@@ -300,18 +403,14 @@ async def extract_tiktok_cdn_direct(url: str) -> Optional[Dict[str, Any]]:
         
         # Method 1: Try TikTok API directly
         api_url = f"https://api16-normal-c-useast1a.tiktokv.com/aweme/v1/feed/?aweme_id={video_id}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive'
-        }
+        headers = _TIKTOK_API_HEADERS
         
-        response = requests.get(api_url, headers=headers, timeout=10)
+        # Run the blocking HTTP call in a worker thread so the event loop
+        # stays free for other requests
+        response = await asyncio.to_thread(_http_session.get, api_url, headers=headers, timeout=10)
         if response.status_code == 200:
             try:
-                data = response.json()
+                data = _json_loads(response.content)
                 if data.get('aweme_list') and len(data['aweme_list']) > 0:
                     aweme = data['aweme_list'][0]
                     return {
@@ -324,58 +423,57 @@ async def extract_tiktok_cdn_direct(url: str) -> Optional[Dict[str, Any]]:
                         'thumbnail': aweme.get('video', {}).get('cover', {}).get('url_list', [''])[0],
                         'formats': []
                     }
-            except:
+            except (ValueError, TypeError):
                 pass
         
         # Method 2: Try with different API endpoint
         api_url2 = f"https://api16-normal-c-useast1a.tiktokv.com/aweme/v1/play/?video_id={video_id}"
-        response2 = requests.get(api_url2, headers=headers, timeout=10)
+        response2 = await asyncio.to_thread(_http_session.get, api_url2, headers=headers, timeout=10)
         if response2.status_code == 200:
             # This might give us direct video URLs
             pass
         
-        # Method 3: Try TikTok-specific libraries
-        try:
-            # Try tiktok-api library
-            from tiktok_api import TikTokApi
-            api = TikTokApi()
-            video_data = api.get_video_by_url(url)
-            if video_data:
-                return {
-                    'uploader': video_data.get('author', {}).get('unique_id', unique_id),
-                    'title': video_data.get('desc', f'TikTok Video {video_id}'),
-                    'description': video_data.get('desc', ''),
-                    'duration': video_data.get('video', {}).get('duration', 0),
-                    'view_count': video_data.get('statistics', {}).get('play_count', 0),
-                    'upload_date': video_data.get('create_time', 0),
-                    'thumbnail': video_data.get('video', {}).get('cover', {}).get('url_list', [''])[0],
-                    'formats': []
-                }
-        except ImportError:
+        # Method 3: Try tiktok-api library
+        if TikTokApi is not None:
+            try:
+                api = TikTokApi()
+                video_data = api.get_video_by_url(url)
+                if video_data:
+                    return {
+                        'uploader': video_data.get('author', {}).get('unique_id', unique_id),
+                        'title': video_data.get('desc', f'TikTok Video {video_id}'),
+                        'description': video_data.get('desc', ''),
+                        'duration': video_data.get('video', {}).get('duration', 0),
+                        'view_count': video_data.get('statistics', {}).get('play_count', 0),
+                        'upload_date': video_data.get('create_time', 0),
+                        'thumbnail': video_data.get('video', {}).get('cover', {}).get('url_list', [''])[0],
+                        'formats': []
+                    }
+            except Exception as e:
+                logger.warning(f"tiktok-api extraction failed: {e}")
+        else:
             logger.warning("tiktok-api library not available")
-        except Exception as e:
-            logger.warning(f"tiktok-api extraction failed: {e}")
-        
+
         # Method 4: Try tiktok-downloader library
-        try:
-            from tiktok_downloader import TikTokDownloader
-            downloader = TikTokDownloader()
-            video_info = downloader.get_video_info(url)
-            if video_info:
-                return {
-                    'uploader': video_info.get('author', unique_id),
-                    'title': video_info.get('title', f'TikTok Video {video_id}'),
-                    'description': video_info.get('description', ''),
-                    'duration': video_info.get('duration', 0),
-                    'view_count': video_info.get('view_count', 0),
-                    'upload_date': video_info.get('upload_date', 0),
-                    'thumbnail': video_info.get('thumbnail', ''),
-                    'formats': video_info.get('formats', [])
-                }
-        except ImportError:
+        if TikTokDownloader is not None:
+            try:
+                downloader = TikTokDownloader()
+                video_info = downloader.get_video_info(url)
+                if video_info:
+                    return {
+                        'uploader': video_info.get('author', unique_id),
+                        'title': video_info.get('title', f'TikTok Video {video_id}'),
+                        'description': video_info.get('description', ''),
+                        'duration': video_info.get('duration', 0),
+                        'view_count': video_info.get('view_count', 0),
+                        'upload_date': video_info.get('upload_date', 0),
+                        'thumbnail': video_info.get('thumbnail', ''),
+                        'formats': video_info.get('formats', [])
+                    }
+            except Exception as e:
+                logger.warning(f"tiktok-downloader extraction failed: {e}")
+        else:
             logger.warning("tiktok-downloader library not available")
-        except Exception as e:
-            logger.warning(f"tiktok-downloader extraction failed: {e}")
         
         return None
         
@@ -398,56 +496,32 @@ async def extract_tiktok_info_direct(url: str) -> Optional[Dict[str, Any]]:
             'extract_flat': True,
             'skip_download': True,
             'ignoreerrors': True,
-            'http_headers': {
-                'User-Agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1'
-            }
+            'http_headers': dict(_MOBILE_HTML_HEADERS)
         }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(url, download=False)
-                if info and not info.get('_type') == 'playlist':
-                    return info
-            except Exception as e:
-                logger.warning(f"Direct TikTok extraction failed: {e}")
-        
-        # Method 2: Try with different extractor
-        ydl_opts.update({
-            'extractor_args': {
-                'tiktok': {
-                    'api_hostname': 'api16-normal-c-useast1a.tiktokv.com',
-                    'app_version': '1.0.0',
-                    'manifest_app_version': '1.0.0'
-                }
-            }
-        })
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(url, download=False)
-                if info and not info.get('_type') == 'playlist':
-                    return info
-            except Exception as e:
-                logger.warning(f"TikTok with extractor args failed: {e}")
-        
+        # Methods 1+2: race the plain options against the extractor-args
+        # variant and take whichever usable result lands first
+        ydl_opts_api = dict(ydl_opts)
+        ydl_opts_api['extractor_args'] = {k: dict(v) for k, v in _TIKTOK_EXTRACTOR_ARGS.items()}
+
+        info = await _race_extract_attempts(url, (ydl_opts, ydl_opts_api))
+        if info:
+            return info
+
+        ydl_opts = ydl_opts_api
+
         # Method 3: Try with cookies
         ydl_opts.update({
             'cookiesfrombrowser': ('chrome',),
             'extract_flat': False
         })
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(url, download=False)
-                if info and not info.get('_type') == 'playlist':
-                    return info
-            except Exception as e:
-                logger.warning(f"TikTok with cookies failed: {e}")
+        try:
+            info = await asyncio.to_thread(_ydl_extract_info, url, ydl_opts)
+            if info and not info.get('_type') == 'playlist':
+                return info
+        except Exception as e:
+            logger.warning(f"TikTok with cookies failed: {e}")
         
         return None
         
@@ -470,25 +544,23 @@ async def extract_tiktok_info(url: str) -> Optional[Dict[str, Any]]:
             'ignoreerrors': True,
         })
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(url, download=False)
-                if info and not info.get('_type') == 'playlist':
-                    return info
-            except Exception as e:
-                logger.warning(f"Flat extraction failed: {e}")
+        try:
+            info = await asyncio.to_thread(_ydl_extract_info, url, ydl_opts)
+            if info and not info.get('_type') == 'playlist':
+                return info
+        except Exception as e:
+            logger.warning(f"Flat extraction failed: {e}")
         
         # Try with different user agent
         ydl_opts = get_yt_dlp_opts('tiktok')
         ydl_opts['http_headers']['User-Agent'] = 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0.3 Mobile/15E148 Safari/604.1'
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            try:
-                info = ydl.extract_info(url, download=False)
-                if info and not info.get('_type') == 'playlist':
-                    return info
-            except Exception as e:
-                logger.warning(f"Mobile user agent extraction failed: {e}")
+        try:
+            info = await asyncio.to_thread(_ydl_extract_info, url, ydl_opts)
+            if info and not info.get('_type') == 'playlist':
+                return info
+        except Exception as e:
+            logger.warning(f"Mobile user agent extraction failed: {e}")
         
         return None
         
@@ -496,6 +568,36 @@ async def extract_tiktok_info(url: str) -> Optional[Dict[str, Any]]:
         logger.error(f"TikTok extraction failed: {e}")
         return None
 
+# Platforms with specialized extraction paths; anything else goes through
+# plain yt-dlp. New platform handlers only need an entry here.
+_PLATFORM_EXTRACTORS = {
+    'tiktok': extract_tiktok_info,
+}
+
+# Short-lived cache of successful info dicts keyed by URL, so repeated
+# requests for the same post (UI polls, retries) skip a full re-extraction.
+# Bounded LRU so a flood of unique URLs can't grow memory without limit.
+_INFO_CACHE_TTL = 300  # seconds
+_INFO_CACHE_MAX = 256  # entries
+_info_cache: OrderedDict = OrderedDict()
+
+def _info_cache_get(url: str) -> Optional[Dict[str, Any]]:
+    """Return a cached info dict for the URL if it hasn't expired"""
+    entry = _info_cache.get(url)
+    if entry:
+        if entry[0] > time.monotonic():
+            _info_cache.move_to_end(url)
+            return entry[1]
+        _info_cache.pop(url, None)
+    return None
+
+def _info_cache_put(url: str, info: Dict[str, Any]) -> None:
+    """Cache an extracted info dict for the URL, evicting the oldest entries"""
+    _info_cache[url] = (time.monotonic() + _INFO_CACHE_TTL, info)
+    _info_cache.move_to_end(url)
+    while len(_info_cache) > _INFO_CACHE_MAX:
+        _info_cache.popitem(last=False)
+
 async def extract_social_media_info(url: str, include_media_urls: bool = True, include_thumbnail: bool = True, include_audio: bool = False) -> Dict[str, Any]:
     """Extract comprehensive information from social media URL"""
     start_time = time.time()
@@ -529,21 +631,26 @@ async def extract_social_media_info(url: str, include_media_urls: bool = True, i
             "time_end": None
         }
         
-        # Platform-specific extraction
-        if platform == 'tiktok':
-            info = await extract_tiktok_info(url)
-        else:
-            # Use standard yt-dlp for other platforms
-            ydl_opts = get_yt_dlp_opts(platform)
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        # Platform-specific extraction (recent results are cached per URL)
+        info = _info_cache_get(url)
+        if info is None:
+            extractor = _PLATFORM_EXTRACTORS.get(platform)
+            if extractor is not None:
+                info = await extractor(url)
+            else:
+                # Use standard yt-dlp for other platforms, off the event loop
+                ydl_opts = get_yt_dlp_opts(platform)
+
                 try:
-                    info = ydl.extract_info(url, download=False)
+                    info = await asyncio.to_thread(_ydl_extract_info, url, ydl_opts)
                 except Exception as e:
                     info = None
                     result["error"] = True
                     result["error_message"] = str(e)
                     logger.error(f"Error extracting info from {url}: {e}")
+
+            if info and not result["error"]:
+                _info_cache_put(url, info)
         
         if info and not result["error"]:
             # Basic information
@@ -560,16 +667,13 @@ async def extract_social_media_info(url: str, include_media_urls: bool = True, i
             
             # Media formats
             if include_media_urls and info.get('formats'):
-                formats = info.get('formats', [])
-                
-                for format_info in formats:
-                    media_info = categorize_media_format(format_info, platform)
-                    
-                    # Filter based on preferences
-                    if not include_audio and media_info["type"] == "audio":
+                for format_info in info['formats']:
+                    # Skip audio-only formats before building the media dict
+                    if not include_audio and format_info.get('vcodec') == 'none' \
+                            and format_info.get('acodec') != 'none':
                         continue
-                        
-                    result["medias"].append(media_info)
+
+                    result["medias"].append(categorize_media_format(format_info, platform))
             
             # Handle playlists
             if info.get('_type') == 'playlist':
@@ -673,13 +777,14 @@ async def extract_info(request: SocialMediaRequest):
         if not url.startswith(('http://', 'https://')):
             raise HTTPException(status_code=400, detail="Invalid URL format")
         
-        # Extract information
-        result = await extract_social_media_info(
-            url, 
-            include_media_urls=request.include_media_urls,
-            include_thumbnail=request.include_thumbnail,
-            include_audio=request.include_audio
-        )
+        # Extract information (bounded concurrency)
+        async with extraction_semaphore:
+            result = await extract_social_media_info(
+                url,
+                include_media_urls=request.include_media_urls,
+                include_thumbnail=request.include_thumbnail,
+                include_audio=request.include_audio
+            )
         
         return result
         